@@ -0,0 +1,104 @@
+"""
+Compare the fp32 and int8 BGE-Small embedding modes on a sample corpus.
+
+Reports throughput (docs/sec) and single-query latency for the production fp32 model,
+the int8 model and its unquantized reference (BAAI's fp32 ONNX graph). Accuracy is
+measured int8 against the reference, which is the same graph, so it isolates the
+effect of quantization: cosine agreement per document and recall@k of nearest-neighbour search.
+
+Usage:
+    python benchmark_embeddings.py                      # sample recent PubMed abstracts
+    python benchmark_embeddings.py --corpus docs.txt    # one document per line
+    python benchmark_embeddings.py --threads 4 --batch-size 64 --k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from embedding_models import EMBEDDING_BATCH_SIZE, EMBEDDING_THREADS, build_model
+
+
+def load_corpus(path: str | None, size: int) -> list[str]:
+    if path:
+        with open(path) as f:
+            docs = [line.strip() for line in f if line.strip()]
+        return docs[:size]
+
+    from pubmed import fetch_pubmed_articles
+    print(f"[INFO] No corpus given. Fetching up to {size} PubMed abstracts...")
+    articles = fetch_pubmed_articles(max_results=size)
+    return [a["abstract"] for a in articles if a.get("abstract", "").strip()]
+
+
+def embed_corpus(model, docs, batch_size):
+    start = time.perf_counter()
+    vectors = np.asarray(list(model.embed(docs, batch_size=batch_size)), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    return vectors, elapsed
+
+
+def query_latencies(model, queries):
+    """Per-query latency in milliseconds, embedding one text at a time as /search does."""
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        list(model.embed([q]))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.asarray(latencies)
+
+
+def top_k(vectors, n_queries, k):
+    """Top-k neighbours of the first n_queries documents, excluding each query itself."""
+    # Vectors are L2-normalized, so the dot product is the cosine similarity
+    scores = vectors[:n_queries] @ vectors.T
+    # Mask by index rather than dropping rank 0, which may be a duplicate document
+    idx = np.arange(n_queries)
+    scores[idx, idx] = -np.inf
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fp32 vs int8 embedding benchmark")
+    parser.add_argument("--corpus", help="Text file with one document per line (default: PubMed sample)")
+    parser.add_argument("--size", type=int, default=200, help="Number of documents to use")
+    parser.add_argument("--queries", type=int, default=50, help="Number of documents reused as queries")
+    parser.add_argument("--k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--threads", type=int, default=EMBEDDING_THREADS)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus, args.size)
+    if len(docs) <= args.k:
+        raise SystemExit(f"[ERROR] Need more than k={args.k} documents, got {len(docs)}.")
+    queries = docs[:args.queries]
+    print(f"[INFO] Corpus: {len(docs)} docs, {len(queries)} queries, "
+          f"threads={args.threads or 'auto'}, batch_size={args.batch_size}")
+
+    results = {}
+    for precision in ("fp32", "reference", "int8"):
+        model = build_model(precision, threads=args.threads)
+        list(model.embed(["warm-up"]))  # exclude session start-up from the timings
+        vectors, elapsed = embed_corpus(model, docs, args.batch_size)
+        latencies = query_latencies(model, queries)
+        results[precision] = vectors
+        print(f"\n=== {precision} ===")
+        print(f"Throughput:    {len(docs) / elapsed:8.1f} docs/sec ({elapsed:.2f}s total)")
+        print(f"Query latency: p50 {np.percentile(latencies, 50):6.2f} ms | "
+              f"p95 {np.percentile(latencies, 95):6.2f} ms")
+
+    ref, int8 = results["reference"], results["int8"]
+    cosine = np.sum(ref * int8, axis=1) / (np.linalg.norm(ref, axis=1) * np.linalg.norm(int8, axis=1))
+
+    n = len(queries)
+    expected = top_k(ref, n, args.k)
+    candidate = top_k(int8, n, args.k)
+    recall = np.mean([len(set(r) & set(c)) / args.k for r, c in zip(expected, candidate)])
+
+    print("\n=== int8 vs unquantized reference agreement ===")
+    print(f"Cosine similarity: mean {cosine.mean():.4f} | min {cosine.min():.4f}")
+    print(f"Recall@{args.k}:         {recall:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 # create_collection.py
-from qdrant_client import QdrantClient
 from qdrant_client.models import VectorParams, Distance
+from qdrant_clients import get_client
 
 COLLECTION_NAME = "Articles"
 VECTOR_SIZE = 384  # must match your embedding model
 
-client = QdrantClient(host="localhost", port=6333)
+client = get_client()
 
 collections = [c.name for c in client.get_collections().collections]
 
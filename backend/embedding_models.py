@@ -0,0 +1,115 @@
+import fcntl
+import os
+import shutil
+import tempfile
+
+from fastembed import TextEmbedding
+
+# --- BGE-Small Model Variants ---
+# Building blocks for embeddings.py and benchmark_embeddings.py. Importing this module
+# loads nothing; models are only downloaded/created when build_model() is called.
+MODEL_NAME = "BAAI/bge-small-en-v1.5"
+REFERENCE_MODEL_NAME = "bge-small-en-v1.5-baai-fp32"
+INT8_MODEL_NAME = "bge-small-en-v1.5-int8"
+VECTOR_SIZE = 384
+
+# Files taken from the BAAI repository: the fp32 ONNX graph plus the tokenizer
+MODEL_FILE = "onnx/model.onnx"
+TOKENIZER_FILES = ["config.json", "tokenizer.json", "tokenizer_config.json", "special_tokens_map.json"]
+
+# --- Embedding Runtime Settings ---
+# EMBEDDING_PRECISION selects the model used for search and ingestion:
+#   "fp32" (default) - FastEmbed's registered BGE-Small export, as used to build existing collections
+#   "int8"           - an int8 dynamic-quantized copy of BAAI's fp32 ONNX graph, faster on CPU
+#   "reference"      - BAAI's fp32 ONNX graph itself, i.e. int8 without the quantization
+# Run benchmark_embeddings.py to measure the trade-off.
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "fp32").lower()
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", 0)) or None  # None = ONNX Runtime default
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+INT8_MODEL_DIR = os.getenv(
+    "EMBEDDING_INT8_MODEL_DIR",
+    os.path.join(os.path.dirname(__file__), "ai_model", INT8_MODEL_NAME)
+)
+
+
+def download_model() -> str:
+    """Fetch BAAI's fp32 ONNX export and tokenizer (cached by the Hugging Face Hub)."""
+    from huggingface_hub import snapshot_download
+    return snapshot_download(repo_id=MODEL_NAME, allow_patterns=[MODEL_FILE] + TOKENIZER_FILES)
+
+
+def quantize_model(output_dir: str = INT8_MODEL_DIR) -> str:
+    """
+    Export an int8 dynamic-quantized copy of the fp32 graph into output_dir (once).
+    The export is built in a temporary directory and moved into place under a file
+    lock, so concurrent workers never see (or load) a half-written model.
+    """
+    if os.path.exists(output_dir):
+        return output_dir
+
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+
+    with open(f"{output_dir}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            # Another worker may have finished the export while we waited for the lock
+            if os.path.exists(output_dir):
+                return output_dir
+
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            print(f"[INFO] Quantizing {MODEL_NAME} to int8 into {output_dir} (one-time)...")
+            source_dir = download_model()
+            tmp_dir = tempfile.mkdtemp(prefix=".int8-", dir=parent)
+            try:
+                os.makedirs(os.path.join(tmp_dir, os.path.dirname(MODEL_FILE)))
+                for name in TOKENIZER_FILES:
+                    shutil.copy(os.path.join(source_dir, name), os.path.join(tmp_dir, name))
+                quantize_dynamic(
+                    os.path.join(source_dir, MODEL_FILE),
+                    os.path.join(tmp_dir, MODEL_FILE),
+                    weight_type=QuantType.QInt8,
+                )
+                os.replace(tmp_dir, output_dir)
+            except BaseException:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            print(f"[INFO] int8 model written to {output_dir}")
+            return output_dir
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _register(model_name: str):
+    from fastembed.common.model_description import ModelSource, PoolingType
+
+    if any(m["model"] == model_name for m in TextEmbedding.list_supported_models()):
+        return
+    # Same architecture as BGE-Small: CLS pooling followed by L2 normalization
+    TextEmbedding.add_custom_model(
+        model=model_name,
+        pooling=PoolingType.CLS,
+        normalization=True,
+        sources=ModelSource(hf=MODEL_NAME),
+        dim=VECTOR_SIZE,
+        model_file=MODEL_FILE,
+    )
+
+
+def build_model(precision: str = EMBEDDING_PRECISION, threads: int | None = EMBEDDING_THREADS) -> TextEmbedding:
+    """
+    Create a FastEmbed BGE-Small model for the requested precision ("fp32", "int8" or
+    "reference"). "int8" and "reference" run the same BAAI graph and differ only by quantization.
+    """
+    if precision == "fp32":
+        return TextEmbedding(model_name=MODEL_NAME, threads=threads)
+    if precision == "int8":
+        model_name, model_dir = INT8_MODEL_NAME, quantize_model()
+    elif precision == "reference":
+        model_name, model_dir = REFERENCE_MODEL_NAME, download_model()
+    else:
+        raise ValueError(f"Unknown EMBEDDING_PRECISION '{precision}' (expected 'fp32', 'int8' or 'reference')")
+
+    _register(model_name)
+    return TextEmbedding(model_name=model_name, specific_model_path=model_dir, threads=threads)
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+# --- Shared Embedding Service ---
+# When uvicorn runs with several workers, each worker would otherwise load its own
+# copy of BGE-Small, the model2vec chunker and TensorFlow + the SMILES model.
+# Setting EMBEDDING_SERVICE_SOCKET makes the workers forward their batches to a single
+# process (started with `python embedding_service.py`) over a local Unix socket.
+# Vectors come back as raw float32 numpy buffers, never as JSON.
+# Leave the variable unset to keep everything in-process (the default).
+SOCKET_PATH = os.getenv("EMBEDDING_SERVICE_SOCKET")
+# Messages are pickled, so the socket must only accept peers holding this secret.
+# There is deliberately no default: both the service and the workers must set it.
+AUTHKEY = os.getenv("EMBEDDING_SERVICE_AUTHKEY", "").encode() or None
+CONNECT_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_CONNECT_TIMEOUT", 30))
+REQUEST_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_REQUEST_TIMEOUT", 60))
+# Loading the models inside a worker when the service is down brings back the
+# per-worker memory cost, so it only happens when explicitly allowed.
+ALLOW_FALLBACK = os.getenv("EMBEDDING_SERVICE_FALLBACK", "false").lower() in ("1", "true", "yes")
+
+_local = threading.local()
+
+
+class EmbeddingServiceError(RuntimeError):
+    """Raised when the shared embedding service reports a failure or cannot be reached."""
+
+
+def enabled() -> bool:
+    """True when workers should delegate model work to the shared service."""
+    return bool(SOCKET_PATH)
+
+
+def _connect():
+    """Open (or reuse) this thread's connection to the service."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+    if AUTHKEY is None:
+        raise AuthenticationError("EMBEDDING_SERVICE_AUTHKEY is not set")
+
+    # The service may still be loading its models (cold start) or restarting,
+    # so keep retrying for CONNECT_TIMEOUT seconds from this request on.
+    deadline = time.time() + CONNECT_TIMEOUT
+    while True:
+        try:
+            conn = Client(SOCKET_PATH, family="AF_UNIX", authkey=AUTHKEY)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.5)
+
+    _local.conn = conn
+    return conn
+
+
+def _drop_connection():
+    conn = getattr(_local, "conn", None)
+    _local.conn = None
+    if conn is not None:
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+
+def request(op: str, payload):
+    """
+    Send one batch to the shared service and return its result.
+    Raises OSError/EOFError if the service is unreachable or does not answer within
+    REQUEST_TIMEOUT, and EmbeddingServiceError if the service itself failed.
+    """
+    conn = _connect()
+    try:
+        conn.send((op, payload))
+        if not conn.poll(REQUEST_TIMEOUT):
+            raise TimeoutError(f"no answer to '{op}' within {REQUEST_TIMEOUT:.0f}s")
+        status, result = conn.recv()
+    except (OSError, EOFError):
+        # A late answer would desynchronize the connection, so never reuse it.
+        _drop_connection()
+        raise
+
+    if status != "ok":
+        raise EmbeddingServiceError(result)
+    return result
+
+
+def call(op: str, payload, fallback):
+    """
+    Run op on the shared service, or call fallback(payload) in-process if the
+    service is unreachable and EMBEDDING_SERVICE_FALLBACK allows it.
+    """
+    try:
+        return request(op, payload)
+    except AuthenticationError as e:
+        print(f"[ERROR] Embedding service rejected this worker ({e}). "
+              f"Check that EMBEDDING_SERVICE_AUTHKEY matches the service.")
+        reason = e
+    except (OSError, EOFError) as e:
+        reason = e
+
+    if not ALLOW_FALLBACK:
+        raise EmbeddingServiceError(f"Embedding service unavailable for '{op}': {reason}")
+    print(f"[WARN] Embedding service unavailable ({reason}). Running '{op}' in-process.")
+    return fallback(payload)
+
+
+# --- Server side ---
+
+def _handlers():
+    # Imported here so that the client side never pulls in the models.
+    from embeddings import _chunk_text_local, _embed_local
+    from smiles import _encode_smiles_local, get_model
+
+    # Warm up every model once, in this process only.
+    _embed_local(["warm-up"])
+    _chunk_text_local("Warm-up sentence for the semantic chunker. " * 4)
+    get_model()
+
+    # Every worker connection gets its own thread. ONNX Runtime sessions can run
+    # concurrently, but Keras predict() and the chunker are not thread-safe.
+    chunk_lock = threading.Lock()
+    smiles_lock = threading.Lock()
+
+    def chunk(text):
+        with chunk_lock:
+            return _chunk_text_local(text)
+
+    def smiles(smiles_list):
+        with smiles_lock:
+            return _encode_smiles_local(smiles_list)
+
+    return {
+        "embed": lambda texts: np.asarray(_embed_local(texts), dtype=np.float32),
+        "chunk": chunk,
+        "smiles": smiles,
+    }
+
+
+def _serve_connection(conn, handlers):
+    with conn:
+        while True:
+            try:
+                op, payload = conn.recv()
+            except (EOFError, OSError):
+                return
+
+            handler = handlers.get(op)
+            if handler is None:
+                reply = ("error", f"Unknown operation '{op}'")
+            else:
+                try:
+                    reply = ("ok", handler(payload))
+                except Exception as e:
+                    print(f"[ERROR] Embedding service failed on '{op}': {e}")
+                    reply = ("error", str(e))
+
+            try:
+                conn.send(reply)
+            except (EOFError, OSError):
+                # The worker gave up (e.g. request timeout) and closed its end.
+                return
+
+
+def serve(socket_path: str = SOCKET_PATH):
+    """Load the models once and answer worker requests until interrupted."""
+    if not socket_path:
+        raise SystemExit("EMBEDDING_SERVICE_SOCKET is not set; nothing to serve.")
+    if AUTHKEY is None:
+        raise SystemExit("EMBEDDING_SERVICE_AUTHKEY is not set; refusing to serve without a shared secret.")
+
+    # The service must always run the models itself, never forward to itself
+    # (this also covers the copy of this module imported by embeddings/smiles).
+    global SOCKET_PATH
+    SOCKET_PATH = None
+    os.environ.pop("EMBEDDING_SERVICE_SOCKET", None)
+
+    handlers = _handlers()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    # Create the socket owner-only from the start, rather than chmod-ing it after bind
+    old_umask = os.umask(0o077)
+    try:
+        listener = Listener(socket_path, family="AF_UNIX", authkey=AUTHKEY)
+    finally:
+        os.umask(old_umask)
+    print(f"[INFO] Embedding service listening on {socket_path}")
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # Failed handshakes (e.g. wrong authkey) must not bring the service down.
+                print(f"[WARN] Rejected embedding service connection: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(conn, handlers), daemon=True).start()
+    except KeyboardInterrupt:
+        print("[INFO] Embedding service shutting down.")
+    finally:
+        listener.close()
+
+
+if __name__ == "__main__":
+    serve()
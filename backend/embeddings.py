@@ -1,30 +1,69 @@
-from fastembed import TextEmbedding
+import threading
+
 from chonkie import SemanticChunker
 import numpy as np
 
-# --- 1. Initialize FastEmbed (For Search Vectors) ---
-# This uses the BGE-Small model (Transformer) for high-quality search relevance.
-# It runs on ONNX Runtime (CPU optimized).
-model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
-print("[INFO] Embedding model initialized with FastEmbed (BGE-Small)")
-
-# --- 2. Initialize Chonkie (For Splitting Text) ---
-# We pass the model name as a string. Chonkie handles the backend loading internally.
-# "minishlab/potion-base-8M" uses the lightweight Model2Vec engine (Static Embeddings).
-try:
-    chunker = SemanticChunker(
-        embedding_model="minishlab/potion-base-8M", 
-        threshold=0.5, 
-        chunk_size=512
-    )
-    print("[INFO] SemanticChunker initialized (Model: potion-base-8M)")
-except Exception as e:
-    # If the [model2vec] extra isn't installed, this might fail.
-    print(f"[WARN] Could not initialize SemanticChunker: {e}. Will use fallback.")
-    chunker = None
+import embedding_service
+from embedding_models import EMBEDDING_BATCH_SIZE, EMBEDDING_PRECISION, EMBEDDING_THREADS, build_model
+
+# Models are loaded lazily so that, when the shared embedding service is enabled
+# (see embedding_service.py), uvicorn workers never load their own copies.
+model = None
+chunker = None
+_chunker_loaded = False
+_model_lock = threading.Lock()
+_chunker_lock = threading.Lock()
+
+
+def get_model():
+    # --- 1. Initialize FastEmbed (For Search Vectors) ---
+    # This uses the BGE-Small model (Transformer) for high-quality search relevance.
+    # It runs on ONNX Runtime (CPU optimized), optionally int8-quantized.
+    global model
+    with _model_lock:
+        if model is None:
+            model = build_model()
+            print(f"[INFO] Embedding model initialized with FastEmbed (BGE-Small, {EMBEDDING_PRECISION}, "
+                  f"threads={EMBEDDING_THREADS or 'auto'}, batch_size={EMBEDDING_BATCH_SIZE})")
+    return model
+
+
+def get_chunker():
+    # --- 2. Initialize Chonkie (For Splitting Text) ---
+    # We pass the model name as a string. Chonkie handles the backend loading internally.
+    # "minishlab/potion-base-8M" uses the lightweight Model2Vec engine (Static Embeddings).
+    global chunker, _chunker_loaded
+    with _chunker_lock:
+        if not _chunker_loaded:
+            _chunker_loaded = True
+            try:
+                chunker = SemanticChunker(
+                    embedding_model="minishlab/potion-base-8M", 
+                    threshold=0.5, 
+                    chunk_size=512
+                )
+                print("[INFO] SemanticChunker initialized (Model: potion-base-8M)")
+            except Exception as e:
+                # If the [model2vec] extra isn't installed, this might fail.
+                print(f"[WARN] Could not initialize SemanticChunker: {e}. Will use fallback.")
+                chunker = None
+    return chunker
+
+
+if not embedding_service.enabled():
+    # In-process mode: load eagerly so start-up logs show the model status.
+    get_model()
+    get_chunker()
 
 
 def chunk_text(text: str) -> list[str]:
+    """Chunk text through the shared embedding service if enabled, else in-process."""
+    if embedding_service.enabled():
+        return embedding_service.call("chunk", text, _chunk_text_local)
+    return _chunk_text_local(text)
+
+
+def _chunk_text_local(text: str) -> list[str]:
     """
     Chunk text using chonkie SemanticChunker with minishlab/potion-base-8M model.
     Returns a list of text chunks.
@@ -34,6 +73,7 @@ def chunk_text(text: str) -> list[str]:
         return [text]
     
     # Try semantic chunking with Chonkie
+    chunker = get_chunker()
     if chunker:
         try:
             chunks = chunker.chunk(text)
@@ -68,7 +108,22 @@ def chunk_text(text: str) -> list[str]:
 
 def embed(texts):
     """Return a list of numpy arrays for the given texts."""
+    texts = list(texts)
+    if embedding_service.enabled():
+        # Send large inputs (e.g. a whole ingestion run) in slices so that each
+        # request stays well within the service's request timeout. The service
+        # answers each slice with a single (n, dim) float32 array.
+        vectors = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            batch = texts[start:start + EMBEDDING_BATCH_SIZE]
+            vectors.extend(embedding_service.call("embed", batch, _embed_local))
+        return vectors
+    return _embed_local(texts)
+
+
+def _embed_local(texts):
+    """Embed texts with the model loaded in this process."""
     # FastEmbed's API exposes `embed` which returns a generator of vectors
-    embeddings = model.embed(texts)
+    embeddings = get_model().embed(texts, batch_size=EMBEDDING_BATCH_SIZE)
     # Convert generator to list of numpy arrays immediately
     return [np.asarray(v) for v in embeddings]
\ No newline at end of file
@@ -1,7 +1,6 @@
 from fastapi import FastAPI
 from ingest import update_database
-from qdrant_client import QdrantClient
-import os
+from qdrant_clients import get_client, search_params
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -16,11 +15,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Read Qdrant host/port from environment so Docker Compose service name works
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
-
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+client = get_client()
 
 
 @app.get("/")
@@ -34,7 +29,14 @@ def update_db():
 
 
 @app.get("/search")
-def semantic_search(query: str, limit: int = 12, offset: int = 0, search_type: str = "text"):
+def semantic_search(
+    query: str,
+    limit: int = 12,
+    offset: int = 0,
+    search_type: str = "text",
+    latency_budget_ms: float | None = None,
+    exact: bool = False,
+):
     from embeddings import embed
     from qdrant_db import COLLECTION, PROTEIN_COLLECTION
     from smiles import search_similar_smiles
@@ -42,7 +44,7 @@ def semantic_search(query: str, limit: int = 12, offset: int = 0, search_type: s
     
     # Determine collection name based on search type
     if search_type == "molecule":
-        return search_similar_smiles(query, limit=limit)
+        return search_similar_smiles(query, limit=limit, latency_budget_ms=latency_budget_ms, exact=exact)
 
     vector = embed([query])[0]
     
@@ -53,7 +55,8 @@ def semantic_search(query: str, limit: int = 12, offset: int = 0, search_type: s
         query=vector.tolist(),
         using="text",
         limit=limit,
-        offset=offset
+        offset=offset,
+        search_params=search_params(latency_budget_ms, exact)
     )
     results = response.points
 
@@ -0,0 +1,110 @@
+import os
+import threading
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import SearchParams
+
+# --- Shared Qdrant Client Factory ---
+# Every module gets its Qdrant clients from here, so each process keeps one client
+# (and one connection pool) per Qdrant deployment instead of one per module.
+# Read host/port from environment so Docker Compose service name works.
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+QDRANT_URL = os.getenv("QDRANT_URL")  # overrides host/port when set
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", 10))  # seconds, per request
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", 20))
+
+# Remote Qdrant Cloud cluster holding the SMILES latent vectors (molecule search is
+# disabled when these are not set)
+SMILES_QDRANT_URL = os.getenv("SMILES_QDRANT_URL")
+SMILES_QDRANT_API_KEY = os.getenv("SMILES_QDRANT_API_KEY")
+
+# Latency budget (ms) -> hnsw_ef. Tighter budgets explore fewer graph candidates.
+HNSW_EF_BY_BUDGET = [
+    (20, 32),
+    (50, 64),
+    (200, 128),
+]
+HNSW_EF_MAX = 256  # budgets above the last tier
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def _grpc_available() -> bool:
+    try:
+        import grpc  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _client_kwargs(url: str | None, api_key: str | None) -> dict:
+    kwargs = {
+        "prefer_grpc": QDRANT_PREFER_GRPC and _grpc_available(),
+        "timeout": QDRANT_TIMEOUT,
+        "api_key": api_key,
+        # Shared keep-alive pool for the REST transport (also used when gRPC is off)
+        "limits": httpx.Limits(
+            max_connections=QDRANT_POOL_SIZE,
+            max_keepalive_connections=QDRANT_POOL_SIZE,
+        ),
+    }
+    if url:
+        kwargs["url"] = url
+    else:
+        kwargs.update(host=QDRANT_HOST, port=QDRANT_PORT, grpc_port=QDRANT_GRPC_PORT)
+    return kwargs
+
+
+def _get(key: str, factory):
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+
+def get_client() -> QdrantClient:
+    """Shared sync client for the main (local/Docker) Qdrant instance."""
+    return _get("main", lambda: QdrantClient(**_client_kwargs(QDRANT_URL, QDRANT_API_KEY)))
+
+
+def get_async_client() -> AsyncQdrantClient:
+    """Shared async client for the main Qdrant instance, for use from async endpoints."""
+    return _get("main_async", lambda: AsyncQdrantClient(**_client_kwargs(QDRANT_URL, QDRANT_API_KEY)))
+
+
+def get_smiles_client() -> QdrantClient | None:
+    """
+    Shared sync client for the Qdrant Cloud cluster holding the SMILES collection,
+    or None if SMILES_QDRANT_URL / SMILES_QDRANT_API_KEY are not configured.
+    """
+    if not (SMILES_QDRANT_URL and SMILES_QDRANT_API_KEY):
+        return None
+    return _get("smiles", lambda: QdrantClient(**_client_kwargs(SMILES_QDRANT_URL, SMILES_QDRANT_API_KEY)))
+
+
+def search_params(latency_budget_ms: float | None = None, exact: bool = False) -> SearchParams | None:
+    """
+    Build per-request search parameters.
+    exact=True forces a full (brute-force) scan for maximum recall, e.g. batch jobs.
+    latency_budget_ms maps to an hnsw_ef value so interactive queries can trade recall for speed.
+    Returns None (collection defaults) when neither is given.
+    """
+    if exact:
+        return SearchParams(exact=True)
+    if latency_budget_ms is None:
+        return None
+
+    for budget, ef in HNSW_EF_BY_BUDGET:
+        if latency_budget_ms <= budget:
+            return SearchParams(hnsw_ef=ef)
+    return SearchParams(hnsw_ef=HNSW_EF_MAX)
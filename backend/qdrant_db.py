@@ -1,13 +1,8 @@
-import os
 import time
 import socket
 import hashlib
-from qdrant_client import QdrantClient
 from qdrant_client.models import VectorParams, Distance, PointStruct
-
-# Read host/port from environment to work in Docker Compose
-QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
-QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+from qdrant_clients import QDRANT_HOST, QDRANT_PORT, QDRANT_URL, get_client
 
 COLLECTION = "Articles"
 PROTEIN_COLLECTION = "protein_context"
@@ -27,11 +22,11 @@ def wait_for_service(host: str, port: int, timeout: int = 30) -> bool:
     return False
 
 
-if not wait_for_service(QDRANT_HOST, QDRANT_PORT, timeout=30):
+if not QDRANT_URL and not wait_for_service(QDRANT_HOST, QDRANT_PORT, timeout=30):
     print(f"[WARN] Qdrant not reachable at {QDRANT_HOST}:{QDRANT_PORT} during startup. Operations will retry and may fail until Qdrant is available.")
 
-# Initialize Qdrant client (will connect to service name inside Docker)
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+# Shared Qdrant client (will connect to service name inside Docker)
+client = get_client()
 
 
 def generate_point_id(pmid: int, chunk_text: str) -> int: